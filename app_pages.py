@@ -18,6 +18,9 @@ def load_data_files(symbol_list, data_folder, start_date, end_date=None, columns
     for symbol in symbol_list:
         fname = os.path.join(data_folder, f"{symbol}_ohlcv_data.csv")
         df_orig = pd.read_csv(fname)
+        if "open_time" not in df_orig.columns:
+            remove_sym.append(symbol)
+            continue
         if columns == "simple":
             df_orig = df_orig[["open_time", "open", "high", "low", "close", "volume"]]
         df_orig = df_orig.rename(columns={"open_time": "date"})
@@ -47,6 +50,10 @@ config = load_config("strategy_modules/trade_configs.yaml")
 STRATEGIES_FOLDER = config["web"]["strategy"]["dir"]
 FILE_NAMES = config["web"]["strategy"]["ftypes"]
 OHLCV_DIR = config["ohlcv_data"]["1d"]["dir"]
+OHLCV_FNAME_SUFFIX = config["ohlcv_data"]["fname"].replace("symbol", "")
+SCREENER_CONFIG = config["web"]["screener"]
+SNAPSHOT_DIR = config["web"]["snapshot"]["dir"]
+RESPONSE_CONFIG = config["web"]["response"]
 BRAND_ICON_DIR = "assets/icons/gems.png"
 
 
@@ -58,6 +65,14 @@ def get_strategy_list(STRATEGIES_FOLDER):
     
     return strategy_list
 
+def get_symbol_list(OHLCV_DIR):
+    symbol_list = []
+    for file in sorted(os.listdir(OHLCV_DIR)):
+        if file.endswith(OHLCV_FNAME_SUFFIX):
+            symbol_list.append(file[:-len(OHLCV_FNAME_SUFFIX)])
+
+    return symbol_list
+
 # Create strategy list
 strategy_list = get_strategy_list(STRATEGIES_FOLDER)
 
@@ -157,6 +172,7 @@ def dashboard_layout():
                                 options=[
                                     {"label": "Status", "value": 1},
                                     {"label": "History", "value": 2},
+                                    {"label": "Exposure", "value": 3},
                                 ],
                                 value=1,
                             ),
@@ -208,6 +224,99 @@ def dashboard_layout():
                 })
     return dashboard_layout
 
+def screener_layout():
+    screener_layout = html.Div([
+        html.Div([
+            html.H1("Screener"),
+            dbc.RadioItems(
+                id="screener-btn-group",
+                className="btn-group time-selector",
+                inputClassName="btn-check",
+                labelClassName="btn time-btn",
+                labelCheckedClassName="btn-selected",
+                options=[
+                    {"label": "All", "value": 1},
+                    {"label": "SMA Cross", "value": 2},
+                    {"label": "BBands Approach", "value": 3},
+                ],
+                value=1,
+            ),
+        ], className="row-div"),
+        html.Br(),
+        dbc.Card([
+            dbc.CardBody([
+                html.Div([
+                    html.H2("Signals"),
+                    html.P(id="screener-info", style={"margin-bottom":"0px"}),
+                ], className="row-div"),
+                html.Br(),
+                html.Div(id="screener-table", children=[], className="pop-out"),
+            ])
+        ], className="graph-card"),
+    ], style={
+            'width': '100%',
+            'margin-left': 15,
+            'margin-top': 35,
+            'margin-bottom': 35
+            })
+    return screener_layout
+
+def compare_layout():
+    compare_layout = html.Div([
+        html.Div([
+            html.H1("Compare"),
+            html.Div([
+                html.H4("Select Strategies"),
+                dcc.Dropdown(
+                    id="compare-strategies-dropdown",
+                    options=strategy_list,
+                    value=strategy_list[:2],
+                    multi=True,
+                    className="customDropdown"
+                    ),
+            ], style={"width": "40%"}),
+        ], className="row-div"),
+        html.Br(),
+        dbc.Card([
+            dbc.CardBody([
+                html.Div([
+                    html.H2("Performance"),
+                    dbc.RadioItems(
+                        id="compare-btn-group",
+                        className="btn-group time-selector",
+                        inputClassName="btn-check",
+                        labelClassName="btn time-btn",
+                        labelCheckedClassName="btn-selected",
+                        options=[
+                            {"label": "Equity", "value": 1},
+                            {"label": "PnL", "value": 2},
+                            {"label": "Drawdown", "value": 3},
+                        ],
+                        value=1,
+                    ),
+                ], className="row-div"),
+                html.Br(),
+                dcc.Graph(id="compare-figure", animate=True),
+            ])
+        ], className="graph-card"),
+        html.Br(),
+        dbc.Card([
+            dbc.CardBody([
+                html.Div([
+                    html.H2("Statistics"),
+                    html.Br(),
+                    html.Div(id="compare-stats-table", children=[], className="pop-out"),
+                ]),
+            ])
+        ], className="graph-card"),
+    ], style={
+            'width': '100%',
+            'margin-left': 15,
+            'margin-top': 35,
+            'margin-bottom': 35
+            })
+    return compare_layout
+
 def page_1_layout():
     page_1_layout = html.Div([
         html.H2("Page 1"),
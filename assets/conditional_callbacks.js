@@ -0,0 +1,45 @@
+// Conditional requests for Dash callbacks
+// Browsers do not revalidate POST responses, so keep the last payload per request body
+// and replay it when the server answers 304 Not Modified.
+(function () {
+    const originalFetch = window.fetch.bind(window);
+    const payloadCache = new Map();
+    const maxEntries = 200;
+
+    window.fetch = function (input, init) {
+        const url = input instanceof Request ? input.url : String(input);
+        if (!url.endsWith("_dash-update-component") || !init || typeof init.body !== "string") {
+            return originalFetch(input, init);
+        }
+
+        const key = init.body;
+        const cached = payloadCache.get(key);
+        if (cached) {
+            const headers = new Headers(init.headers);
+            headers.set("If-None-Match", cached.etag);
+            init = Object.assign({}, init, {headers: headers});
+        }
+
+        return originalFetch(input, init).then(function (response) {
+            if (response.status === 304 && cached) {
+                return new Response(cached.body, {
+                    status: 200,
+                    headers: {"Content-Type": "application/json"},
+                });
+            }
+
+            const etag = response.headers.get("ETag");
+            if (response.status === 200 && etag) {
+                response.clone().text().then(function (body) {
+                    payloadCache.delete(key);
+                    payloadCache.set(key, {etag: etag, body: body});
+                    if (payloadCache.size > maxEntries) {
+                        payloadCache.delete(payloadCache.keys().next().value);
+                    }
+                });
+            }
+
+            return response;
+        });
+    };
+})();
@@ -1,13 +1,32 @@
+import collections
+import contextlib
+import fcntl
+import gzip
+import hashlib
+import json
+import tempfile
+import threading
+import traceback
 import dash
 from dash import dcc, html, dash_table
 from dash.dependencies import Input, Output
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import dash_ag_grid as dag
 from app_pages import *
 import pandas as pd
+import numpy as np
+import plotly
 import plotly.graph_objs as go
 import plotly.express as px
+from plotly.subplots import make_subplots
 import vectorbt as vbt
+from flask import Response, g, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 
 # Initialize Dash app
@@ -50,26 +69,134 @@ def dataframe_to_json(df):
 def json_to_dataframe(df_json):
     return pd.read_json(df_json)
 
+def set_datetime_index(df):
+    # Log timestamps are written both naive and with a UTC offset, index all of them as naive UTC
+    df = df.set_index("Unnamed: 0")
+    df.index = pd.to_datetime(df.index, utc=True).tz_localize(None)
+
+    return df
+
 def modify_dataframes(dataframes):
     # Manipulate data as appropriate
-    dataframes["unrealized_pnl"] = dataframes["unrealized_pnl"].set_index("Unnamed: 0")
-    dataframes["realized_pnl"] = dataframes["realized_pnl"].set_index("Unnamed: 0")
-    dataframes["position"] = dataframes["position"].set_index("Unnamed: 0")
+    for name in ["unrealized_pnl", "realized_pnl", "position", "balance_cash"]:
+        dataframes[name] = set_datetime_index(dataframes[name])
     dataframes["entry_info"] = dataframes["entry_info"].rename(columns={"Unnamed: 0": "symbols"})
 
-    dataframes["unrealized_pnl"].index = pd.to_datetime(dataframes["unrealized_pnl"].index).tz_localize(None)
-    dataframes["realized_pnl"].index = pd.to_datetime(dataframes["realized_pnl"].index).tz_localize(None)
-    dataframes["position"].index = pd.to_datetime(dataframes["position"].index).tz_localize(None)
+    # The first balance row has no timestamp and holds the initial balance
+    dataframes["balance_cash"].index = dataframes["balance_cash"].index.fillna(pd.Timestamp.min)
 
     return dataframes
 
-def load_ohlcv_data(available_symbols):
+# OHLCV frames shared by every strategy, keyed by symbol with the file modification time
+# Cached frames are shared between callers and must be treated as read-only
+# Symbols dropped by load_data_files are cached with df None so they are not re-read on every call
+ohlcv_cache = {}
+ohlcv_cache_lock = threading.Lock()
+
+OHLCV_SIMPLE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+def get_last_line_offset(fname):
+    # Byte offset where the last row of the file starts
+    with open(fname, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        start = max(file.tell() - 4096, 0)
+        file.seek(start)
+        chunk = file.read().rstrip(b"\r\n")
+
+    return start + chunk.rfind(b"\n") + 1
+
+def read_ohlcv_tail(fname, cached):
+    # Rows from the cached last row onwards, None if the file was rewritten instead of appended to
+    # The collector writes plain csv with the header first, no quoted fields and open_time in the first column,
+    # and only ever revises the last (still open) candle; anything else falls back to load_data_files
+    if os.path.getsize(fname) < cached["offset"]:
+        return None
+    with open(fname, "r") as file:
+        file.seek(cached["offset"])
+        lines = file.read().splitlines()
+
+    rows = [line.split(",") for line in lines if line]
+    if len(rows) == 0 or rows[0][0] != cached["last_date"]:
+        return None
+
+    positions = [cached["columns"].index(col) for col in OHLCV_SIMPLE_COLUMNS]
+    try:
+        values = [[float(row[pos]) for pos in positions] for row in rows]
+    except (ValueError, IndexError):
+        return None
+
+    return [row[0] for row in rows], values
+
+def update_cached_ohlcv_frames(tails, mtimes):
+    # Parse the dates of every tail at once, then replace each cached last row with its tail rows
+    all_dates = [date for dates, _ in tails.values() for date in dates]
+    parsed_dates = pd.to_datetime(pd.Index(all_dates), utc=True).tz_localize(None)
+
+    start = 0
+    for symbol, (dates, values) in tails.items():
+        index = parsed_dates[start:start + len(dates)]
+        start += len(dates)
+
+        cached = ohlcv_cache[symbol]
+        df = cached["df"]
+        new_index = df.index[:-1].append(index)
+        new_index.name = df.index.name
+        df = pd.DataFrame(np.vstack([df.values[:-1], values]), index=new_index, columns=df.columns)
+
+        fname = os.path.join(OHLCV_DIR, symbol + OHLCV_FNAME_SUFFIX)
+        ohlcv_cache[symbol] = dict(cached, mtime=mtimes[symbol], df=df,
+                                   offset=get_last_line_offset(fname), last_date=dates[-1])
+
+def load_shared_ohlcv_frames(available_symbols):
     start_date = (pd.Timestamp.now() - pd.Timedelta(days=10)).strftime("%Y-%m-%d")
     start_date = "2010-01-01"
 
-    ohlcv_dataloader = load_data_files(available_symbols, OHLCV_DIR, start_date=start_date)
+    with ohlcv_cache_lock:
+        # Only read symbols that are not cached yet or whose file changed
+        mtimes = {}
+        tails = {}
+        stale_symbols = []
+        for symbol in available_symbols:
+            fname = os.path.join(OHLCV_DIR, symbol + OHLCV_FNAME_SUFFIX)
+            mtimes[symbol] = os.path.getmtime(fname) if os.path.exists(fname) else None
+            cached = ohlcv_cache.get(symbol)
+            if cached is not None and cached["mtime"] == mtimes[symbol]:
+                continue
+
+            # Appended or revised last rows are read from the last known row instead of the whole file
+            tail = None
+            if cached is not None and cached["df"] is not None and mtimes[symbol] is not None:
+                tail = read_ohlcv_tail(fname, cached)
+            if tail is not None:
+                tails[symbol] = tail
+            else:
+                stale_symbols.append(symbol)
+
+        if tails:
+            update_cached_ohlcv_frames(tails, mtimes)
+
+        if stale_symbols:
+            ohlcv_dataloader = load_data_files(list(stale_symbols), OHLCV_DIR, start_date=start_date)
+            for symbol in stale_symbols:
+                df = ohlcv_dataloader.get(symbol)
+                entry = {"mtime": mtimes[symbol], "df": df}
+                if df is not None:
+                    fname = os.path.join(OHLCV_DIR, symbol + OHLCV_FNAME_SUFFIX)
+                    df.index = df.index.tz_localize(None)
+                    with open(fname, "r") as file:
+                        entry["columns"] = file.readline().strip().split(",")
+                    entry["offset"] = get_last_line_offset(fname)
+                    with open(fname, "r") as file:
+                        file.seek(entry["offset"])
+                        entry["last_date"] = file.readline().split(",")[0]
+                ohlcv_cache[symbol] = entry
+
+        return {symbol: ohlcv_cache[symbol]["df"] for symbol in available_symbols
+                if symbol in ohlcv_cache and ohlcv_cache[symbol]["df"] is not None}
+
+def load_ohlcv_data(available_symbols):
+    ohlcv_dataloader = load_shared_ohlcv_frames(available_symbols)
     ohlcv_multidf = pd.concat(ohlcv_dataloader).unstack(0)
-    ohlcv_multidf.index = ohlcv_multidf.index.tz_localize(None)
     
     return ohlcv_multidf
 
@@ -89,21 +216,47 @@ def create_pnl_figure(dataframes):
 
     return fig
 
+def asof_join(df, index):
+    # Backward as-of join: last known row at or before each timestamp
+    df = df[~df.index.isna()].sort_index()
+    df = df[~df.index.duplicated(keep="last")]
+
+    return df.ffill().reindex(index, method="ffill")
+
 def calculate_pos_val(dataframes, ohlcv_multidf):
-    close_df = ohlcv_multidf["close"]
-    pos_val = dataframes["position"] * close_df.loc[dataframes["position"].index]
+    position = dataframes["position"]
+    close_df = ohlcv_multidf["close"].reindex(columns=position.columns)
+    pos_val = position * asof_join(close_df, position.index)
 
     return pos_val
 
-def create_pos_val_figure(pos_val):
-    pos = pos_val.iloc[-1]
-    date = pos.name
+def calculate_exposure(dataframes, pos_val):
+    balance_cash = asof_join(dataframes["balance_cash"], pos_val.index)
+    abs_val = pos_val.abs()
+
+    exposure = pd.DataFrame(index=pos_val.index)
+    exposure["long"] = pos_val.clip(lower=0).sum(axis=1)
+    exposure["short"] = -pos_val.clip(upper=0).sum(axis=1)
+    exposure["gross"] = exposure["long"] + exposure["short"]
+    exposure["net"] = exposure["long"] - exposure["short"]
+    exposure["balance"] = balance_cash["current_balance"]
+    exposure["cash"] = balance_cash["free_cash"]
+    exposure["leverage"] = exposure["gross"] / exposure["balance"]
+    exposure["net_leverage"] = exposure["net"] / exposure["balance"]
+
+    # Concentration: long/short share of gross and Herfindahl index over symbols
+    gross = exposure["gross"].where(exposure["gross"] > 0)
+    exposure["long_share"] = exposure["long"] / gross
+    exposure["short_share"] = exposure["short"] / gross
+    exposure["max_weight"] = abs_val.max(axis=1) / gross
+    exposure["hhi"] = (abs_val.div(gross, axis=0) ** 2).sum(axis=1, min_count=1)
+
+    return exposure
 
+def create_pos_val_figure(pos_val):
+    # Last four snapshots, fewer when the strategy just started
     fig = go.Figure(data=[
-        go.Bar(name=pos_val.index[-4].strftime("%Y-%m-%d"), x=pos_val.columns, y=pos_val.iloc[-4]),
-        go.Bar(name=pos_val.index[-3].strftime("%Y-%m-%d"), x=pos_val.columns, y=pos_val.iloc[-3]),
-        go.Bar(name=pos_val.index[-2].strftime("%Y-%m-%d"), x=pos_val.columns, y=pos_val.iloc[-2]),
-        go.Bar(name=pos_val.index[-1].strftime("%Y-%m-%d"), x=pos_val.columns, y=pos_val.iloc[-1]),
+        go.Bar(name=date.strftime("%Y-%m-%d"), x=pos_val.columns, y=row) for date, row in pos_val.iloc[-4:].iterrows()
     ])
     
     fig.update_layout(
@@ -116,8 +269,9 @@ def create_pos_val_figure(pos_val):
 
     return fig
 
-def create_pos_val_sunburst_figure(pos_val):
+def create_pos_val_sunburst_figure(pos_val, exposure):
     pos = pos_val.iloc[-1]
+    leverage = exposure["leverage"].iloc[-1]
     df = pd.DataFrame()
     df["Value"] = pos
     df["PositionSide"] = "Long"
@@ -141,8 +295,9 @@ def create_pos_val_sunburst_figure(pos_val):
                       color='PositionSide',
                       color_discrete_map=custom_colors)
     
+    # Show current leverage in the center instead of the root label
     labels = fig.data[0]['labels']
-    labels[-1] = ""
+    labels[-1] = f"{leverage:.2f}x" if pd.notna(leverage) else ""
 
     fig.update_traces(
         opacity=1,
@@ -162,14 +317,13 @@ def create_pos_val_sunburst_figure(pos_val):
 
     return fig
 
-def create_sunburst_bar_figure(pos_val):
-    pos = pos_val.iloc[-1]
-    date = pos.name
+def create_sunburst_bar_figure(exposure):
+    latest = exposure.iloc[-1]
 
-    total_dollar = abs(pos).sum()
-    long_dollar = abs(pos[pos > 0]).sum()
-    short_dollar = abs(pos[pos < 0]).sum()
-    cash = total_dollar - long_dollar - short_dollar
+    total_dollar = latest["gross"]
+    long_dollar = latest["long"]
+    short_dollar = latest["short"]
+    cash = latest["cash"]
 
     custom_colors = {
         'Long': '#69EBA6', 
@@ -199,6 +353,37 @@ def create_sunburst_bar_figure(pos_val):
 
     return fig
 
+def create_exposure_figure(exposure):
+    # Dollar exposure and leverage on top, long/short concentration of the gross exposure below
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.65, 0.35], vertical_spacing=0.06,
+                        specs=[[{"secondary_y": True}], [{}]])
+
+    fig.add_trace(go.Scatter(name="Gross", x=exposure.index, y=exposure["gross"], line_color="#944FBE"), row=1, col=1)
+    fig.add_trace(go.Scatter(name="Net", x=exposure.index, y=exposure["net"], line_color="#4CD4C8"), row=1, col=1)
+    fig.add_trace(go.Scatter(name="Long", x=exposure.index, y=exposure["long"], line_color="#69EBA6"), row=1, col=1)
+    fig.add_trace(go.Scatter(name="Short", x=exposure.index, y=exposure["short"], line_color="#E0305B"), row=1, col=1)
+    fig.add_trace(go.Scatter(name="Leverage", x=exposure.index, y=exposure["leverage"],
+                             line=dict(color="#FFD166", dash="dot")), row=1, col=1, secondary_y=True)
+
+    fig.add_trace(go.Scatter(name="Long share", x=exposure.index, y=exposure["long_share"], stackgroup="share",
+                             line_color="#69EBA6"), row=2, col=1)
+    fig.add_trace(go.Scatter(name="Short share", x=exposure.index, y=exposure["short_share"], stackgroup="share",
+                             line_color="#E0305B"), row=2, col=1)
+    fig.add_trace(go.Scatter(name="Max weight", x=exposure.index, y=exposure["max_weight"],
+                             line=dict(color="#FFFFFF", dash="dot")), row=2, col=1)
+    fig.add_trace(go.Scatter(name="HHI", x=exposure.index, y=exposure["hhi"],
+                             line=dict(color="#FFD166", dash="dash")), row=2, col=1)
+
+    fig.update_yaxes(title_text="Dollars ($)", row=1, col=1, secondary_y=False)
+    fig.update_yaxes(title_text="Leverage (x)", row=1, col=1, secondary_y=True, showgrid=False)
+    fig.update_yaxes(title_text="Share of gross", row=2, col=1, range=[0, 1], tickformat=".0%")
+    fig.update_layout(
+        template="plotly_dark",
+        margin=dict(l=20, r=20, t=30, b=20),
+    )
+
+    return fig
+
 def create_trades_log_table(dataframes):
     # table = dash_table.DataTable(data=dataframes["trades"].to_dict('records'),
     #     columns=[{'id': c, 'name': c} for c in dataframes["trades"].columns],
@@ -214,135 +399,14 @@ def create_trades_log_table(dataframes):
     
     return grid
 
-def create_dropdown_item_strategies():
-    strategy_list = os.listdir("/home/yong_woo/PycharmProjects/Trader_redesign_v2/logs/strategy/")
-    items = [dbc.DropdownMenuItem(i, id=i) for i in strategy_list]
-
-    return items
-
-
-
-# Define the sidebar layout
-sidebar = html.Div([
-            html.Div([
-                html.A([
-                    html.Div([
-                        html.Img(src=BRAND_ICON_DIR, height="100%"),
-                        dbc.NavbarBrand(html.H1("MagicButton", className="brand"))
-                    ], className="row-div-brand")
-                ],
-                href="/",
-                style={"textDecoration": "none"}),
-            ], style={"margin-bottom": "50px"}),
-
-            # html.Hr(style={"border-color":"gray"}),
-            html.Br(className="navbar-space"),
-
-            dbc.Nav(
-                [
-                    dbc.NavLink([
-                        html.Div([
-                            html.I(className="bi bi-graph-up-arrow"),
-                            # html.I(className="bi bi-clipboard-data"),
-                            "Dashboard"
-                        ], style={"display":"flex", "gap":"10px"})
-                        ], href="/", active="exact"),
-                    # dbc.NavLink([html.I(className="fa-regular fa-clipboard"), "  Dashboard"], href="/", active="exact"),
-                    dbc.NavLink([
-                        html.Div([
-                            html.I(className="bi bi-activity"),
-                            "Simulation"
-                        ], style={"display":"flex", "gap":"10px"})
-                    ], href="/page-1", active="exact"),
-                    dbc.NavLink([
-                        html.Div([
-                            html.I(className="bi bi-box"),
-                            "Analysis"
-                        ], style={"display":"flex", "gap":"10px"})
-                    ], href="/page-2", active="exact"),
-                ],
-                vertical=True,
-                pills=True,
-                className="sidebar-nav"
-            ),
-
-            ], style={
-                'width': '23%',
-                'margin-left': 15,
-                'margin-right': 15,
-                'margin-top': 35,
-                'margin-bottom': 35,
-                "padding-top": 20
-                },
-            className="sidebar")
-
-# Content container where the page layouts will be rendered
-content = html.Div(id="page-content",
-                   style={"padding": "20px",
-                          "background-color": "#161618",
-                          "width":"100%",})
-
-
-app.layout = dbc.Container([
-    dcc.Location(id="url"),  # This component handles page routing
-    sidebar,
-    
-    html.Div([], className="vertical-line"),
-    
-    content,
-
-    # Store to save the loaded dataframes
-    dcc.Store(id='data-store'),
-    dcc.Store(id='ohlcv-store'),
-
-], fluid=True, className="dashboard-container", style={"display":"flex"})
-
-
-# Callback to handle page routing
-@app.callback(
-    Output("page-content", "children"),
-    [Input("url", "pathname")]
-)
-def display_page(pathname):
-    if pathname == "/":
-        return dashboard_layout()  # Return dashboard layout when on homepage
-    elif pathname == "/page-1":
-        return page_1_layout()  # Return Page 1 layout
-    elif pathname == "/page-2":
-        return page_2_layout()  # Return Page 2 layout
-    else:
-        return "404: Page Not Found"
-
-# Update data when strategy selected
-@app.callback(
-    Output("data-store", "data"),
-    Output("ohlcv-store", "data"),
-    Input("strategies-dropdown", "value"),
-)
-def load_and_store_data(selected_folder):
-    folder_path = os.path.join(STRATEGIES_FOLDER, selected_folder)
-    dataframes = load_csv_files(folder_path, FILE_NAMES)
-
-    # Extract available symbols (columns) from any dataframe
-    available_symbols = dataframes["position"].columns.tolist()  # Symbols are columns
-
-    # Load ohlcv data
-    ohlcv_multidf = load_ohlcv_data(available_symbols)
+# Pill style for zero or missing values
+NEUTRAL_PILL_STYLE = {"background-color": "#778899",}
 
-    return dataframe_dict_to_json(dataframes), dataframe_to_json(ohlcv_multidf)
+def get_init_balance(dataframes):
+    balance = dataframes["balance_cash"]["current_balance"]
+    return balance.iloc[0] if len(balance) > 0 else 0
 
-# Update trades table when strategy selected
-@app.callback(
-    Output("trades-table", "children"),
-    Output("trading-fee-value", "children"),
-    Output("trading-fee-value", "style"),
-    Output("trading-fee-percent", "children"),
-    Output("trading-fee-percent", "style"),
-    Input("data-store", "data")
-)
-def update_trades_fee_info(data_json):
-    dataframes = json_to_dataframe_dict(data_json)
-    
+def create_trades_fee_info(dataframes):
     # Update trades table
     grid = dag.AgGrid(
         id="trades-log-grid",
@@ -352,18 +416,18 @@ def update_trades_fee_info(data_json):
         columnSize="sizeToFit"
     )
 
-    init_balance = dataframes["balance_cash"]["current_balance"].iloc[0]
+    init_balance = get_init_balance(dataframes)
 
     df = dataframes["trades"].copy()
     df = df.loc[df["status"] != "failed"]
     df = df[["quantity", "price", "order_type"]]
     df["fee_percent"] = config["trading_fee"]["binance"]["futures"]["market"]
-    df.loc[df["order_type"] == "LIMIT"] = config["trading_fee"]["binance"]["futures"]["limit"]
+    df.loc[df["order_type"] == "LIMIT", "fee_percent"] = config["trading_fee"]["binance"]["futures"]["limit"]
 
     df["dollar_fee"] = df["quantity"] * df["price"] * df["fee_percent"] / 100
 
     total_dollar_fee = df["dollar_fee"].sum()
-    total_percent_fee = total_dollar_fee / init_balance * 100
+    total_percent_fee = total_dollar_fee / init_balance * 100 if init_balance else 0
 
     if total_dollar_fee > 0:
         total_dollar_fee = f"-$ {abs(round(total_dollar_fee, 2)):,}"
@@ -372,17 +436,17 @@ def update_trades_fee_info(data_json):
         total_percent_fee = f"↘ {round(total_percent_fee, 2):,}%"
         style_percent = {"background-color": "#ff8fa2",}
 
-    
+    # No fee paid yet
+    else:
+        total_dollar_fee = "$ 0.0"
+        style = {}
+
+        total_percent_fee = "0.0%"
+        style_percent = NEUTRAL_PILL_STYLE
+
     return grid, total_dollar_fee, style, total_percent_fee, style_percent
 
-# Update trades table when strategy selected
-@app.callback(
-    Output("entry-info-table", "children"),
-    Input("data-store", "data")
-)
-def update_entry_info_table(data_json):
-    dataframes = json_to_dataframe_dict(data_json)
-    
+def create_entry_info_grid(dataframes):
     grid = dag.AgGrid(
         id="entry-info-grid",
         rowData=dataframes["entry_info"].to_dict('records'),
@@ -393,27 +457,11 @@ def update_entry_info_table(data_json):
     
     return grid
 
-# Update figures when strategy selected
-@app.callback(
-    # Output("position-value-figure", "figure"),
-    Output("pos-val-graph-div", "children"),
-    Input("data-store", "data"),
-    Input("ohlcv-store", "data"),
-    Input("pos-val-btn-group", "value"),
-)
-def update_pos_val_figure(data_json, ohlcv_json, btn_val):
-    dataframes = json_to_dataframe_dict(data_json)
-
-    ohlcv_multidf = json_to_dataframe(ohlcv_json)
-    multi_index = pd.MultiIndex.from_tuples([eval(col) for col in ohlcv_multidf.columns])
-    ohlcv_multidf.columns = multi_index
-
-    pos_val = calculate_pos_val(dataframes, ohlcv_multidf)
-
+def create_pos_val_children(pos_val, exposure, btn_val):
     if btn_val == 1:
         children = []
 
-        fig = create_pos_val_sunburst_figure(pos_val)
+        fig = create_pos_val_sunburst_figure(pos_val, exposure)
 
         # Common figure settings
         fig.update_layout(
@@ -424,7 +472,7 @@ def update_pos_val_figure(data_json, ohlcv_json, btn_val):
             modebar={"bgcolor":'rgba(0, 0, 0, 0)'},
         )
 
-        fig2 = create_sunburst_bar_figure(pos_val)
+        fig2 = create_sunburst_bar_figure(exposure)
 
         fig2.update_layout(
             template="plotly_dark",
@@ -459,16 +507,22 @@ def update_pos_val_figure(data_json, ohlcv_json, btn_val):
         return dcc.Graph(id="position-value-figure",
                         animate=True,
                         figure=fig)
-    
-    # return fig
 
-@app.callback(
-    Output("pnl-figure", "figure"),
-    Input("data-store", "data"),
-    Input("pnl-btn-group", "value"),
-)
-def update_pnl_figure(data_json, button_value):
-    dataframes = json_to_dataframe_dict(data_json)
+    elif btn_val == 3:
+        fig = create_exposure_figure(exposure)
+        fig.update_layout(
+            template="plotly_dark",
+            plot_bgcolor='rgba(0, 0, 0, 0)',
+            paper_bgcolor='rgba(0, 0, 0, 0)',
+            margin=dict(l=20, r=20, t=20, b=20),
+            modebar={"bgcolor":'rgba(0, 0, 0, 0)'},
+        )
+
+        return dcc.Graph(id="exposure-figure",
+                        animate=True,
+                        figure=fig)
+
+def create_pnl_figure_by_value(dataframes, button_value):
     if button_value == 1:
         fig = create_pnl_figure(dataframes)
     # Total
@@ -501,29 +555,18 @@ def update_pnl_figure(data_json, button_value):
     
     return fig
 
-@app.callback(
-    Output("balance-value", "children"),
-    Output("pnl-all-time-value", "children"),
-    Output("pnl-all-time-value", "style"),
-    Output("pnl-all-time-percent", "children"),
-    Output("pnl-all-time-percent", "style"),
-    Output("balance-daily-percent", "children"),
-    Output("balance-daily-percent", "style"),
-    Input("data-store", "data"),
-)
-def update_pnl_values(data_json):
-    dataframes = json_to_dataframe_dict(data_json)
+def create_pnl_values(dataframes):
     df = get_total_pnl_data(dataframes)
-    init_balance = dataframes["balance_cash"]["current_balance"].iloc[0]
+    init_balance = get_init_balance(dataframes)
     
-    all_time_pnl = df["Total PnL"].iloc[-1]
-    all_time_percent = all_time_pnl / init_balance * 100
+    all_time_pnl = df["Total PnL"].iloc[-1] if len(df) > 0 else 0
+    all_time_percent = all_time_pnl / init_balance * 100 if init_balance else 0
 
     current_balance = f"$ {round(init_balance + all_time_pnl, 2):,}"
 
-    # Calculate 1 day pnl
-    daily_pnl = all_time_pnl - df["Total PnL"].iloc[-2]
-    daily_percent = daily_pnl / init_balance * 100
+    # Calculate 1 day pnl, flat until there are two rows
+    daily_pnl = all_time_pnl - df["Total PnL"].iloc[-2] if len(df) > 1 else 0
+    daily_percent = daily_pnl / init_balance * 100 if init_balance else 0
 
     if all_time_pnl < 0:
         all_time_pnl = f"-$ {abs(round(all_time_pnl, 2)):,}"
@@ -540,7 +583,14 @@ def update_pnl_values(data_json):
         # all_time_percent = f"↗ {round(all_time_percent, 2)}%"
         all_time_percent = [html.I(className="bi bi-graph-up-arrow"), f" {round(all_time_percent, 2)}%"]
         style_percent = {"background-color": "#69EBA6",}
-    
+
+    # Flat
+    else:
+        all_time_pnl = "$ 0.0"
+        style = {}
+
+        all_time_percent = "0.0%"
+        style_percent = NEUTRAL_PILL_STYLE
 
 
     if daily_pnl < 0:
@@ -557,8 +607,841 @@ def update_pnl_values(data_json):
         daily_percent = [html.I(className="bi bi-graph-up-arrow"), f" {abs(round(daily_percent, 2))}%"]
         style_daily_percent = {"background-color": "#69EBA6",}
 
+    # Flat day
+    else:
+        daily_percent = "0.0%"
+        style_daily_percent = NEUTRAL_PILL_STYLE
+
     return current_balance, all_time_pnl, style, all_time_percent, style_percent, daily_percent, style_daily_percent
 
+# Strategy logs cached per strategy, keyed by the log files version
+# Callers get their own dict but the DataFrames are shared and must be treated as read-only
+strategy_logs_cache = {}
+
+def load_strategy_logs(selected_folder):
+    validate_strategy(selected_folder)
+    version = get_strategy_data_version(selected_folder, [])
+    cached = strategy_logs_cache.get(selected_folder)
+    if cached is not None and cached[0] == version:
+        return dict(cached[1])
+
+    folder_path = os.path.join(STRATEGIES_FOLDER, selected_folder)
+    dataframes = load_csv_files(folder_path, FILE_NAMES)
+    strategy_logs_cache[selected_folder] = (version, dataframes)
+
+    return dict(dataframes)
+
+# Load strategy logs and the OHLCV panel of its symbols
+def load_strategy_data(selected_folder):
+    dataframes = load_strategy_logs(selected_folder)
+
+    # Extract available symbols (columns) from any dataframe
+    available_symbols = dataframes["position"].columns.tolist()  # Symbols are columns
+
+    # Load ohlcv data
+    ohlcv_multidf = load_ohlcv_data(available_symbols)
+
+    return dataframes, ohlcv_multidf
+
+# Dashboard snapshots loaded from disk, keyed by strategy
+# Bump SNAPSHOT_FORMAT whenever the layout of the snapshot outputs changes
+SNAPSHOT_FORMAT = 4
+snapshot_cache = {}
+snapshot_locks = {}
+
+def is_known_strategy(selected_folder):
+    return isinstance(selected_folder, str) and selected_folder in get_strategy_list(STRATEGIES_FOLDER)
+
+def validate_strategy(selected_folder):
+    # Strategy names come from client payloads and end up in read and write paths
+    if not is_known_strategy(selected_folder):
+        raise ValueError(f"Unknown strategy: {selected_folder!r}")
+
+def get_snapshot_path(selected_folder):
+    return os.path.join(SNAPSHOT_DIR, f"{selected_folder}_snapshot.json")
+
+@contextlib.contextmanager
+def snapshot_file_lock(selected_folder):
+    # Cross-process lock so only one gunicorn worker (or the scheduler) rebuilds a snapshot
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(get_snapshot_path(selected_folder) + ".lock", "w") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+def get_strategy_data_version(selected_folder, symbol_list):
+    # Latest modification time of the strategy logs and its symbols' OHLCV files
+    folder_path = os.path.join(STRATEGIES_FOLDER, selected_folder)
+    paths = [os.path.join(folder_path, file) for file in os.listdir(folder_path)]
+    paths += [os.path.join(OHLCV_DIR, symbol + OHLCV_FNAME_SUFFIX) for symbol in symbol_list]
+
+    return max(os.path.getmtime(path) for path in paths if os.path.exists(path))
+
+def build_snapshot_output(builder, *args):
+    # A failing widget is stored as None so the rest of the dashboard still renders
+    try:
+        return builder(*args)
+    except Exception:
+        traceback.print_exc()
+        return None
+
+def load_versioned_strategy_data(selected_folder):
+    # The version is taken before loading, so files written during a build make the snapshot stale, not falsely fresh
+    # It depends on the symbols of the loaded logs, so load until the symbols and the version stop changing
+    symbol_list = []
+    for _ in range(3):
+        version = get_strategy_data_version(selected_folder, symbol_list)
+        dataframes, ohlcv_multidf = load_strategy_data(selected_folder)
+        loaded_symbols = dataframes["position"].columns.tolist()
+        if loaded_symbols == symbol_list and get_strategy_data_version(selected_folder, symbol_list) == version:
+            break
+        symbol_list = loaded_symbols
+
+    return version, symbol_list, dataframes, ohlcv_multidf
+
+def build_dashboard_snapshot(selected_folder):
+    validate_strategy(selected_folder)
+    version, symbol_list, dataframes, ohlcv_multidf = load_versioned_strategy_data(selected_folder)
+    pos_val = build_snapshot_output(calculate_pos_val, dataframes, ohlcv_multidf)
+    exposure = build_snapshot_output(calculate_exposure, dataframes, pos_val) if pos_val is not None else None
+
+    outputs = {
+        "trades_fee": build_snapshot_output(create_trades_fee_info, dataframes),
+        "entry_info": build_snapshot_output(create_entry_info_grid, dataframes),
+        "pos_val": {str(btn_val): build_snapshot_output(create_pos_val_children, pos_val, exposure, btn_val)
+                    if exposure is not None else None for btn_val in [1, 2, 3]},
+        "pnl": {str(btn_val): build_snapshot_output(create_pnl_figure_by_value, dataframes, btn_val)
+                for btn_val in [1, 2, 3, 4]},
+        "pnl_values": build_snapshot_output(create_pnl_values, dataframes),
+    }
+    snapshot = {
+        "strategy": selected_folder,
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "symbols": symbol_list,
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "outputs": outputs,
+    }
+    # Round trip through JSON so figures and components are served as plain dicts
+    return json.loads(json.dumps(snapshot, cls=plotly.utils.PlotlyJSONEncoder))
+
+def write_dashboard_snapshot(snapshot):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = get_snapshot_path(snapshot["strategy"])
+
+    # Write to a temporary file first so readers never see a partial snapshot
+    fd, tmp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(snapshot, file)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    return path
+
+def read_dashboard_snapshot(selected_folder):
+    path = get_snapshot_path(selected_folder)
+    if not os.path.exists(path):
+        return None
+
+    mtime = os.path.getmtime(path)
+    cached = snapshot_cache.get(selected_folder)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r") as file:
+        snapshot = json.load(file)
+    snapshot_cache[selected_folder] = (mtime, snapshot)
+
+    return snapshot
+
+def is_snapshot_fresh(selected_folder, snapshot):
+    return (snapshot is not None
+            and snapshot.get("format") == SNAPSHOT_FORMAT
+            and snapshot["version"] == get_strategy_data_version(selected_folder, snapshot["symbols"]))
+
+def refresh_dashboard_snapshot(selected_folder, force=False):
+    validate_strategy(selected_folder)
+
+    # Only one thread and one process per strategy recomputes, the others re-read its file
+    lock = snapshot_locks.setdefault(selected_folder, threading.Lock())
+    with lock, snapshot_file_lock(selected_folder):
+        snapshot = read_dashboard_snapshot(selected_folder)
+        if force or not is_snapshot_fresh(selected_folder, snapshot):
+            snapshot = build_dashboard_snapshot(selected_folder)
+            write_dashboard_snapshot(snapshot)
+            snapshot_cache[selected_folder] = (os.path.getmtime(get_snapshot_path(selected_folder)), snapshot)
+
+    return snapshot
+
+def get_dashboard_snapshot(selected_folder):
+    validate_strategy(selected_folder)
+
+    snapshot = read_dashboard_snapshot(selected_folder)
+    if is_snapshot_fresh(selected_folder, snapshot):
+        return snapshot
+
+    # Missing or stale snapshot
+    return refresh_dashboard_snapshot(selected_folder)
+
+def get_snapshot_output(data_store, key, btn_val=None):
+    # Nothing selected yet, or a name that did not come from the dropdown
+    if not isinstance(data_store, dict) or not is_known_strategy(data_store.get("strategy")):
+        raise PreventUpdate
+
+    snapshot = get_dashboard_snapshot(data_store["strategy"])
+    output = snapshot["outputs"][key]
+    if btn_val is not None:
+        output = output[str(btn_val)]
+
+    # The builder of this widget failed, keep whatever is shown
+    if output is None:
+        raise PreventUpdate
+    return output
+
+# Comparison results cached per strategy, keyed by its data version
+strategy_results_cache = {}
+
+def calculate_strategy_results(dataframes, ohlcv_multidf):
+    init_balance = get_init_balance(dataframes)
+    pnl = get_total_pnl_data(dataframes)["Total PnL"]
+    equity = init_balance + pnl
+    drawdown = equity / equity.cummax() - 1
+    returns = equity.pct_change()
+
+    exposure = calculate_exposure(dataframes, calculate_pos_val(dataframes, ohlcv_multidf))
+    trades = dataframes["trades"]
+
+    stats = {
+        "start": equity.index[0].strftime("%Y-%m-%d"),
+        "end": equity.index[-1].strftime("%Y-%m-%d"),
+        "initial_balance": init_balance,
+        "final_balance": equity.iloc[-1],
+        "total_pnl": pnl.iloc[-1],
+        "return_pct": (equity.iloc[-1] / init_balance - 1) * 100,
+        "max_drawdown_pct": drawdown.min() * 100,
+        "sharpe": returns.vbt.returns(freq="1D").sharpe_ratio(),
+        "avg_leverage": exposure["leverage"].mean(),
+        "avg_hhi": exposure["hhi"].mean(),
+        "trades": int((trades["status"] != "failed").sum()),
+    }
+
+    return {"equity": equity, "pnl": pnl, "drawdown": drawdown * 100, "stats": stats}
+
+def get_comparison_data(strategies):
+    dataframes_dict = {strategy: load_strategy_logs(strategy) for strategy in strategies}
+
+    # One OHLCV panel over the union of symbols, shared by every selected strategy
+    symbol_list = sorted(set().union(*[df["position"].columns for df in dataframes_dict.values()]))
+    ohlcv_multidf = None
+
+    results = {}
+    for strategy, dataframes in dataframes_dict.items():
+        version = get_strategy_data_version(strategy, dataframes["position"].columns.tolist())
+        cached = strategy_results_cache.get(strategy)
+        if cached is None or cached[0] != version:
+            if ohlcv_multidf is None:
+                ohlcv_multidf = load_ohlcv_data(symbol_list)
+            cached = (version, calculate_strategy_results(dataframes, ohlcv_multidf))
+            strategy_results_cache[strategy] = cached
+        results[strategy] = cached[1]
+
+    # Align every strategy onto the common date index
+    aligned = {}
+    for key in ["equity", "pnl", "drawdown"]:
+        df = pd.concat({strategy: result[key] for strategy, result in results.items()}, axis=1).sort_index()
+        aligned[key] = df.ffill()
+
+    stats = pd.DataFrame([{"strategy": strategy, **result["stats"]} for strategy, result in results.items()])
+    aligned["stats"] = stats.round(4)
+
+    return aligned
+
+def create_comparison_figure(comparison_data, button_value):
+    key = {1: "equity", 2: "pnl", 3: "drawdown"}[button_value]
+
+    fig = go.Figure()
+    fig = comparison_data[key].vbt.plot(fig=fig)
+
+    return fig
+
+# Screener state cached per candle, keyed by the OHLCV file modification times
+screener_cache = {}
+screener_lock = threading.Lock()
+
+def get_ohlcv_mtimes(symbol_list):
+    mtimes = {}
+    for symbol in symbol_list:
+        fname = os.path.join(OHLCV_DIR, symbol + OHLCV_FNAME_SUFFIX)
+        mtimes[symbol] = os.path.getmtime(fname) if os.path.exists(fname) else None
+
+    return mtimes
+
+def load_close_matrix(symbol_list, prev_close_df=None, changed_symbols=None):
+    # Frames come from the shared OHLCV cache, so only changed files are read from disk
+    ohlcv_dataloader = load_shared_ohlcv_frames(symbol_list)
+    start_date = pd.Timestamp(SCREENER_CONFIG["start_date"])
+
+    if prev_close_df is None or changed_symbols is None:
+        close_df = pd.concat({symbol: df["close"].loc[start_date:] for symbol, df in ohlcv_dataloader.items()}, axis=1)
+        return close_df.sort_index()
+
+    # Patch the cached close matrix with the whole columns of changed symbols
+    # The shared OHLCV cache is refreshed by other pages too, so nothing but the screener's own matrix
+    # tells which bars changed since the last refresh; get_first_changed_row works that out afterwards
+    changed_symbols = [symbol for symbol in changed_symbols if symbol in ohlcv_dataloader]
+    index = prev_close_df.index
+    changed_df = None
+    if changed_symbols:
+        changed_df = pd.concat({symbol: ohlcv_dataloader[symbol]["close"].loc[start_date:] for symbol in changed_symbols},
+                               axis=1)
+        index = index.union(changed_df.index)
+
+    close_df = prev_close_df.reindex(index=index, columns=list(ohlcv_dataloader))
+    if changed_df is not None:
+        close_df[changed_symbols] = changed_df.reindex(index).values
+
+    # Dates left without any bar, e.g. after a file was rewritten
+    return close_df.dropna(how="all")
+
+def calculate_screener_indicators(close_df):
+    # One batched pass over the aligned close matrix, both SMA windows broadcast together
+    fast_window = SCREENER_CONFIG["sma_cross"]["fast_window"]
+    slow_window = SCREENER_CONFIG["sma_cross"]["slow_window"]
+    n_symbols = close_df.shape[1]
+
+    ma = vbt.MA.run(close_df, window=[fast_window, slow_window]).ma.values
+    bbands = vbt.BBANDS.run(close_df,
+                            window=SCREENER_CONFIG["bbands"]["window"],
+                            alpha=SCREENER_CONFIG["bbands"]["alpha"])
+
+    indicators = {
+        "fast_ma": ma[:, :n_symbols],
+        "slow_ma": ma[:, n_symbols:],
+        "bb_upper": bbands.upper.values,
+        "bb_lower": bbands.lower.values,
+    }
+    return {key: pd.DataFrame(val, index=close_df.index, columns=close_df.columns) for key, val in indicators.items()}
+
+def update_screener_indicators(indicators, close_df, n_new):
+    # Compute only the last n_new bars from their trailing windows, the cached indicators are left untouched
+    close = close_df.values
+
+    def rolling_tail(window):
+        tail = close[-(window + n_new - 1):]
+        return np.lib.stride_tricks.sliding_window_view(tail, window, axis=0)
+
+    fast_ma = rolling_tail(SCREENER_CONFIG["sma_cross"]["fast_window"]).mean(axis=-1)
+    slow_ma = rolling_tail(SCREENER_CONFIG["sma_cross"]["slow_window"]).mean(axis=-1)
+
+    bb_windows = rolling_tail(SCREENER_CONFIG["bbands"]["window"])
+    bb_middle = bb_windows.mean(axis=-1)
+    bb_std = bb_windows.std(axis=-1)
+    bb_upper = bb_middle + SCREENER_CONFIG["bbands"]["alpha"] * bb_std
+    bb_lower = bb_middle - SCREENER_CONFIG["bbands"]["alpha"] * bb_std
+
+    n_kept = len(close_df) - n_new
+    new_index = close_df.index[n_kept:]
+    new_rows = {"fast_ma": fast_ma, "slow_ma": slow_ma, "bb_upper": bb_upper, "bb_lower": bb_lower}
+
+    updated = {}
+    for key, val in new_rows.items():
+        new_df = pd.DataFrame(val, index=new_index, columns=close_df.columns)
+        updated[key] = pd.concat([indicators[key].iloc[:n_kept], new_df])
+
+    return updated
+
+def get_screener_signals(close_df, indicators):
+    # Each symbol is evaluated at its own last bar, so symbols not yet written for the newest candle keep showing
+    # Symbols more than max_stale_bars behind the newest candle are delisted or stale
+    valid = close_df.notna().values
+    n_rows = len(close_df)
+    last_rows = n_rows - 1 - np.argmax(valid[::-1], axis=0)
+    cols = np.flatnonzero(valid.any(axis=0) & (n_rows - 1 - last_rows <= SCREENER_CONFIG["max_stale_bars"]))
+    rows = last_rows[cols]
+    prev_rows = np.maximum(rows - 1, 0)
+
+    def at(df, at_rows):
+        return df.values[at_rows, cols]
+
+    close = at(close_df, rows)
+    fast_ma = at(indicators["fast_ma"], rows)
+    slow_ma = at(indicators["slow_ma"], rows)
+    prev_diff = np.where(rows > 0, at(indicators["fast_ma"], prev_rows) - at(indicators["slow_ma"], prev_rows), np.nan)
+    diff = fast_ma - slow_ma
+
+    sma_signal = np.select(
+        [(diff > 0) & (prev_diff <= 0), (diff < 0) & (prev_diff >= 0), diff > 0, diff < 0],
+        ["Cross Up", "Cross Down", "Above", "Below"],
+        default="None",
+    )
+
+    bb_upper = at(indicators["bb_upper"], rows)
+    bb_lower = at(indicators["bb_lower"], rows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_b = (close - bb_lower) / (bb_upper - bb_lower)
+    threshold = SCREENER_CONFIG["bbands"]["approach_threshold"]
+
+    bb_signal = np.select(
+        [percent_b <= threshold, percent_b >= 1 - threshold, ~np.isnan(percent_b)],
+        ["Near Lower", "Near Upper", "Inside"],
+        default="None",
+    )
+
+    df = pd.DataFrame({
+        "symbol": close_df.columns[cols],
+        "candle": close_df.index[rows].strftime("%Y-%m-%d %H:%M"),
+        "close": close,
+        "fast_ma": fast_ma,
+        "slow_ma": slow_ma,
+        "sma_cross": sma_signal,
+        "bb_percent": percent_b,
+        "bb_approach": bb_signal,
+    })
+    df = df.round(6).reset_index(drop=True)
+
+    return df
+
+def get_first_changed_row(prev_close_df, close_df):
+    # Position of the first bar that is new or whose close was revised, None if the history diverged
+    n_prev = len(prev_close_df)
+    if n_prev > len(close_df) or not close_df.index[:n_prev].equals(prev_close_df.index):
+        return None
+
+    prev = prev_close_df.values
+    curr = close_df.values[:n_prev]
+    changed_rows = np.flatnonzero(((prev != curr) & ~(np.isnan(prev) & np.isnan(curr))).any(axis=1))
+
+    return changed_rows[0] if len(changed_rows) else n_prev
+
+def get_screener_data():
+    symbol_list = get_symbol_list(OHLCV_DIR)
+    mtimes = get_ohlcv_mtimes(symbol_list)
+    state = screener_cache.get("state")
+    if state is not None and state["mtimes"] == mtimes:
+        return state
+
+    with screener_lock:
+        # Another request may have refreshed the state while this one waited
+        state = screener_cache.get("state")
+        if state is not None and state["mtimes"] == mtimes:
+            return state
+
+        if state is None:
+            close_df = load_close_matrix(symbol_list)
+        else:
+            changed_symbols = [symbol for symbol in symbol_list if state["mtimes"].get(symbol) != mtimes[symbol]]
+            close_df = load_close_matrix(symbol_list, state["close_df"], changed_symbols)
+
+        max_window = max(SCREENER_CONFIG["sma_cross"]["slow_window"],
+                         SCREENER_CONFIG["sma_cross"]["fast_window"],
+                         SCREENER_CONFIG["bbands"]["window"])
+        first_changed = None
+        if state is not None and close_df.columns.equals(state["close_df"].columns):
+            first_changed = get_first_changed_row(state["close_df"], close_df)
+
+        if first_changed is not None and first_changed == len(close_df):
+            # Files were touched without any new or revised bar
+            indicators = state["indicators"]
+        elif first_changed is not None and first_changed >= max_window:
+            indicators = update_screener_indicators(state["indicators"], close_df, len(close_df) - first_changed)
+        else:
+            indicators = calculate_screener_indicators(close_df)
+
+        state = {
+            "mtimes": mtimes,
+            "close_df": close_df,
+            "indicators": indicators,
+            "signals": get_screener_signals(close_df, indicators),
+        }
+        screener_cache["state"] = state
+
+    return state
+
+def create_dropdown_item_strategies():
+    strategy_list = os.listdir("/home/yong_woo/PycharmProjects/Trader_redesign_v2/logs/strategy/")
+    items = [dbc.DropdownMenuItem(i, id=i) for i in strategy_list]
+
+    return items
+
+
+
+# Define the sidebar layout
+sidebar = html.Div([
+            html.Div([
+                html.A([
+                    html.Div([
+                        html.Img(src=BRAND_ICON_DIR, height="100%"),
+                        dbc.NavbarBrand(html.H1("MagicButton", className="brand"))
+                    ], className="row-div-brand")
+                ],
+                href="/",
+                style={"textDecoration": "none"}),
+            ], style={"margin-bottom": "50px"}),
+
+            # html.Hr(style={"border-color":"gray"}),
+            html.Br(className="navbar-space"),
+
+            dbc.Nav(
+                [
+                    dbc.NavLink([
+                        html.Div([
+                            html.I(className="bi bi-graph-up-arrow"),
+                            # html.I(className="bi bi-clipboard-data"),
+                            "Dashboard"
+                        ], style={"display":"flex", "gap":"10px"})
+                        ], href="/", active="exact"),
+                    # dbc.NavLink([html.I(className="fa-regular fa-clipboard"), "  Dashboard"], href="/", active="exact"),
+                    dbc.NavLink([
+                        html.Div([
+                            html.I(className="bi bi-activity"),
+                            "Simulation"
+                        ], style={"display":"flex", "gap":"10px"})
+                    ], href="/page-1", active="exact"),
+                    dbc.NavLink([
+                        html.Div([
+                            html.I(className="bi bi-funnel"),
+                            "Screener"
+                        ], style={"display":"flex", "gap":"10px"})
+                    ], href="/screener", active="exact"),
+                    dbc.NavLink([
+                        html.Div([
+                            html.I(className="bi bi-layers"),
+                            "Compare"
+                        ], style={"display":"flex", "gap":"10px"})
+                    ], href="/compare", active="exact"),
+                    dbc.NavLink([
+                        html.Div([
+                            html.I(className="bi bi-box"),
+                            "Analysis"
+                        ], style={"display":"flex", "gap":"10px"})
+                    ], href="/page-2", active="exact"),
+                ],
+                vertical=True,
+                pills=True,
+                className="sidebar-nav"
+            ),
+
+            ], style={
+                'width': '23%',
+                'margin-left': 15,
+                'margin-right': 15,
+                'margin-top': 35,
+                'margin-bottom': 35,
+                "padding-top": 20
+                },
+            className="sidebar")
+
+# Content container where the page layouts will be rendered
+content = html.Div(id="page-content",
+                   style={"padding": "20px",
+                          "background-color": "#161618",
+                          "width":"100%",})
+
+
+app.layout = dbc.Container([
+    dcc.Location(id="url"),  # This component handles page routing
+    sidebar,
+    
+    html.Div([], className="vertical-line"),
+    
+    content,
+
+    # Store to save the loaded dataframes
+    dcc.Store(id='data-store'),
+
+], fluid=True, className="dashboard-container", style={"display":"flex"})
+
+
+# Callback to handle page routing
+@app.callback(
+    Output("page-content", "children"),
+    [Input("url", "pathname")]
+)
+def display_page(pathname):
+    if pathname == "/":
+        return dashboard_layout()  # Return dashboard layout when on homepage
+    elif pathname == "/page-1":
+        return page_1_layout()  # Return Page 1 layout
+    elif pathname == "/page-2":
+        return page_2_layout()  # Return Page 2 layout
+    elif pathname == "/screener":
+        return screener_layout()  # Return Screener layout
+    elif pathname == "/compare":
+        return compare_layout()  # Return Compare layout
+    else:
+        return "404: Page Not Found"
+
+# Update data when strategy selected
+@app.callback(
+    Output("data-store", "data"),
+    Input("strategies-dropdown", "value"),
+)
+def load_and_store_data(selected_folder):
+    if not is_known_strategy(selected_folder):
+        raise PreventUpdate
+    snapshot = get_dashboard_snapshot(selected_folder)
+
+    return {"strategy": selected_folder, "version": snapshot["version"]}
+
+# Update trades table when strategy selected
+@app.callback(
+    Output("trades-table", "children"),
+    Output("trading-fee-value", "children"),
+    Output("trading-fee-value", "style"),
+    Output("trading-fee-percent", "children"),
+    Output("trading-fee-percent", "style"),
+    Input("data-store", "data")
+)
+def update_trades_fee_info(data_store):
+    return get_snapshot_output(data_store, "trades_fee")
+
+# Update trades table when strategy selected
+@app.callback(
+    Output("entry-info-table", "children"),
+    Input("data-store", "data")
+)
+def update_entry_info_table(data_store):
+    return get_snapshot_output(data_store, "entry_info")
+
+# Update figures when strategy selected
+@app.callback(
+    # Output("position-value-figure", "figure"),
+    Output("pos-val-graph-div", "children"),
+    Input("data-store", "data"),
+    Input("pos-val-btn-group", "value"),
+)
+def update_pos_val_figure(data_store, btn_val):
+    return get_snapshot_output(data_store, "pos_val", btn_val)
+
+@app.callback(
+    Output("pnl-figure", "figure"),
+    Input("data-store", "data"),
+    Input("pnl-btn-group", "value"),
+)
+def update_pnl_figure(data_store, button_value):
+    return get_snapshot_output(data_store, "pnl", button_value)
+
+@app.callback(
+    Output("balance-value", "children"),
+    Output("pnl-all-time-value", "children"),
+    Output("pnl-all-time-value", "style"),
+    Output("pnl-all-time-percent", "children"),
+    Output("pnl-all-time-percent", "style"),
+    Output("balance-daily-percent", "children"),
+    Output("balance-daily-percent", "style"),
+    Input("data-store", "data"),
+)
+def update_pnl_values(data_store):
+    return get_snapshot_output(data_store, "pnl_values")
+
+# Update screener table when filter selected
+@app.callback(
+    Output("screener-table", "children"),
+    Output("screener-info", "children"),
+    Input("screener-btn-group", "value"),
+)
+def update_screener_table(button_value):
+    screener_data = get_screener_data()
+    df = screener_data["signals"]
+
+    # SMA cross
+    if button_value == 2:
+        df = df.loc[df["sma_cross"].isin(["Cross Up", "Cross Down"])]
+    # BBands approach
+    elif button_value == 3:
+        df = df.loc[df["bb_approach"].isin(["Near Lower", "Near Upper"])]
+
+    grid = dag.AgGrid(
+        id="screener-grid",
+        rowData=df.to_dict('records'),
+        columnDefs=[{'field': c} for c in df.columns],
+        className="ag-theme-balham-dark",
+        columnSize="sizeToFit"
+    )
+
+    last_candle = screener_data["close_df"].index[-1].strftime("%Y-%m-%d %H:%M")
+    info = f"{len(df)} / {len(screener_data['signals'])} symbols · candle {last_candle}"
+
+    return grid, info
+
+# Update comparison when strategies selected
+@app.callback(
+    Output("compare-figure", "figure"),
+    Output("compare-stats-table", "children"),
+    Input("compare-strategies-dropdown", "value"),
+    Input("compare-btn-group", "value"),
+)
+def update_comparison(selected_folders, button_value):
+    selected_folders = [folder for folder in selected_folders or [] if is_known_strategy(folder)]
+    if not selected_folders:
+        return go.Figure(layout=dict(template="plotly_dark",
+                                     plot_bgcolor='rgba(0, 0, 0, 0)',
+                                     paper_bgcolor='rgba(0, 0, 0, 0)')), []
+
+    comparison_data = get_comparison_data(selected_folders)
+    fig = create_comparison_figure(comparison_data, button_value)
+
+    # Common figure settings
+    fig.update_layout(
+        template="plotly_dark",
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+        margin=dict(l=20, r=20, t=20, b=20),
+        modebar={"bgcolor":'rgba(0, 0, 0, 0)'},
+    )
+
+    df = comparison_data["stats"]
+    grid = dag.AgGrid(
+        id="compare-stats-grid",
+        rowData=df.to_dict('records'),
+        columnDefs=[{'field': c} for c in df.columns],
+        className="ag-theme-balham-dark",
+        columnSize="sizeToFit"
+    )
+
+    return fig, grid
+
+# HTTP response layer: compression, conditional callback responses and a store for static responses
+COMPRESSIBLE_MIMETYPES = ("text/", "application/json", "application/javascript")
+STORED_ROUTES = ("_dash-layout", "_dash-dependencies", "assets/", "_dash-component-suites/")
+# Cache busting query parameters Dash appends to asset and component suite urls
+FINGERPRINT_PARAMS = ("v", "m")
+
+# Least recently used compressed responses, bounded by web.response.store_max_entries
+response_store = collections.OrderedDict()
+response_store_lock = threading.Lock()
+
+def get_route():
+    return request.path[len(app.config.routes_pathname_prefix):]
+
+def get_store_key(encoding):
+    # Other query parameters are client controlled and would grow the store without bound
+    return (request.path, *(request.args.get(param) for param in FINGERPRINT_PARAMS), encoding)
+
+def get_stored_response(key):
+    with response_store_lock:
+        stored = response_store.get(key)
+        if stored is not None:
+            response_store.move_to_end(key)
+    return stored
+
+def store_response(key, response):
+    with response_store_lock:
+        response_store[key] = {
+            "data": response.get_data(),
+            "headers": list(response.headers.items()),
+        }
+        response_store.move_to_end(key)
+        while len(response_store) > RESPONSE_CONFIG["store_max_entries"]:
+            response_store.popitem(last=False)
+
+def get_accepted_encoding():
+    if brotli is not None and "br" in request.accept_encodings:
+        return "br"
+    if "gzip" in request.accept_encodings:
+        return "gzip"
+    return None
+
+def compress_response(response, encoding):
+    if (encoding is None
+            or "Content-Encoding" in response.headers
+            or not response.mimetype.startswith(COMPRESSIBLE_MIMETYPES)):
+        return response
+
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < RESPONSE_CONFIG["compress_min_size"]:
+        return response
+
+    if encoding == "br":
+        data = brotli.compress(data, quality=RESPONSE_CONFIG["brotli_quality"])
+    else:
+        data = gzip.compress(data, compresslevel=RESPONSE_CONFIG["gzip_level"])
+
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+
+    return response
+
+def get_callback_etag(payload):
+    # Only callbacks driven by the selected strategy get a version derived ETag
+    strategy = None
+    for item in payload.get("inputs", []):
+        if not isinstance(item, dict):
+            continue
+        if item.get("id") == "strategies-dropdown":
+            strategy = item.get("value")
+        elif item.get("id") == "data-store" and isinstance(item.get("value"), dict):
+            strategy = item["value"].get("strategy")
+
+    if not is_known_strategy(strategy):
+        return None
+
+    # Only an existing fresh snapshot is used, rebuilding and errors are left to the callback
+    try:
+        snapshot = read_dashboard_snapshot(strategy)
+        if not is_snapshot_fresh(strategy, snapshot):
+            return None
+    except Exception:
+        return None
+    version = f"|{snapshot['version']}|{snapshot['created_at']}".encode()
+
+    return hashlib.sha1(request.get_data() + version).hexdigest()
+
+@server.before_request
+def serve_cached_response():
+    route = get_route()
+
+    if route == "_dash-update-component":
+        payload = request.get_json(silent=True) or {}
+        g.etag = get_callback_etag(payload)
+
+        # Identical request on an unchanged data version, skip the callback entirely
+        if g.etag is not None and request.if_none_match.contains_weak(g.etag):
+            response = Response(status=304)
+            response.set_etag(g.etag, weak=True)
+            return response
+
+    elif request.method == "GET" and route.startswith(STORED_ROUTES) and not server.debug:
+        stored = get_stored_response(get_store_key(get_accepted_encoding()))
+        if stored is not None:
+            g.stored = True
+            response = Response(stored["data"], headers=stored["headers"])
+            return response.make_conditional(request)
+
+@server.after_request
+def compress_and_store_response(response):
+    if response.status_code != 200:
+        return response
+
+    route = get_route()
+    encoding = get_accepted_encoding()
+
+    if route == "_dash-update-component":
+        if g.get("etag") is not None:
+            response.set_etag(g.etag, weak=True)
+        return compress_response(response, encoding)
+
+    if request.method == "GET" and route.startswith(STORED_ROUTES) and not g.get("stored"):
+        response = compress_response(response, encoding)
+        response.direct_passthrough = False
+        if "ETag" not in response.headers:
+            response.add_etag()
+
+        if not server.debug:
+            store_response(get_store_key(encoding), response)
+
+        return response.make_conditional(request)
+
+    return response
+
 
 # To run the Dash app independently, uncomment below:
 if __name__ == '__main__':
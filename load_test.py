@@ -0,0 +1,251 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+import requests
+from app_pages import get_strategy_list, STRATEGIES_FOLDER
+
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# Load test settings
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay concurrent dashboard sessions against a local Dash server.")
+    parser.add_argument("--users", type=int, default=20, help="Number of concurrent simulated clients")
+    parser.add_argument("--sessions", type=int, default=5, help="Sessions replayed by each client")
+    parser.add_argument("--workers", type=int, default=2, help="Gunicorn workers of the started server")
+    parser.add_argument("--port", type=int, default=8051, help="Port of the started server")
+    parser.add_argument("--url", default=None, help="Test an already running server instead of starting one")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the strategy picks, same seed replays the same sessions")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds to wait between requests")
+    parser.add_argument("--conditional", action="store_true",
+                        help="Send If-None-Match on repeated callbacks, 304 latencies are reported separately")
+    parser.add_argument("--memory-interval", type=float, default=0.5, help="Seconds between worker memory samples")
+    parser.add_argument("--output", default=None, help="Write raw latencies and memory samples to this JSON file")
+    return parser.parse_args()
+
+def start_server(port, workers):
+    cmd = [sys.executable, "-m", "gunicorn", "dash_app:server",
+           "-w", str(workers), "-b", f"127.0.0.1:{port}", "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {proc.returncode}")
+        try:
+            if requests.get(url + "/_dash-layout", timeout=30).status_code == 200:
+                return proc, url
+        except requests.RequestException:
+            # Workers accept connections before the app finished importing
+            pass
+        time.sleep(0.5)
+
+    proc.terminate()
+    raise RuntimeError("gunicorn did not become ready in time")
+
+# Worker memory sampling from /proc, master plus its worker processes
+def get_process_tree(pid):
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as file:
+            pids += [int(child) for child in file.read().split()]
+    except FileNotFoundError:
+        pass
+    return pids
+
+def get_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as file:
+            return int(file.read().split()[1]) * PAGE_SIZE / 1024 ** 2
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+
+def sample_memory(master_pid, interval, samples, stop_event):
+    start = time.time()
+    while not stop_event.is_set():
+        rss = {pid: get_rss_mb(pid) for pid in get_process_tree(master_pid)}
+        samples.append({"t": round(time.time() - start, 2),
+                        "rss_mb": {str(pid): val for pid, val in rss.items() if val is not None}})
+        stop_event.wait(interval)
+
+# Dash callback payloads built from the served dependency graph
+def get_callback_specs(url):
+    specs = {}
+    for dep in requests.get(url + "/_dash-dependencies", timeout=30).json():
+        outputs = dep["output"].strip(".").split("...")
+        specs[outputs[0]] = dep
+    return specs
+
+def build_payload(dep, values, changed):
+    outputs = []
+    for output in dep["output"].strip(".").split("..."):
+        comp_id, prop = output.rsplit(".", 1)
+        outputs.append({"id": comp_id, "property": prop})
+
+    return {
+        "output": dep["output"],
+        "outputs": outputs if len(outputs) > 1 else outputs[0],
+        "inputs": [{"id": i["id"], "property": i["property"], "value": values.get(f"{i['id']}.{i['property']}")}
+                   for i in dep["inputs"]],
+        "state": [{"id": s["id"], "property": s["property"], "value": values.get(f"{s['id']}.{s['property']}")}
+                  for s in dep["state"]],
+        "changedPropIds": changed,
+    }
+
+class SimulatedClient:
+    def __init__(self, url, specs, strategies, args, index):
+        self.url = url
+        self.specs = specs
+        self.strategies = strategies
+        # Per client results, merged after all threads joined
+        self.latencies = {}
+        self.errors = {}
+        self.args = args
+        self.session = requests.Session()
+        # Seeded per client, so runs with the same seed and number of users replay the same session mix
+        self.random = random.Random(f"{args.seed}:{index}")
+        self.etags = {}
+
+    def record(self, name, start, ok):
+        self.latencies.setdefault(name, []).append(time.perf_counter() - start)
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+        if self.args.think_time:
+            time.sleep(self.args.think_time)
+
+    def get(self, name, path):
+        start = time.perf_counter()
+        try:
+            ok = self.session.get(self.url + path, timeout=60).status_code == 200
+        except requests.RequestException:
+            ok = False
+        self.record(name, start, ok)
+
+    def callback(self, output, values, changed):
+        body = json.dumps(build_payload(self.specs[output], values, changed))
+        headers = {"Content-Type": "application/json"}
+        if self.args.conditional and body in self.etags:
+            headers["If-None-Match"] = self.etags[body][0]
+
+        name = output.split(".")[0]
+        start = time.perf_counter()
+        data = None
+        try:
+            response = self.session.post(self.url + "/_dash-update-component", data=body, headers=headers, timeout=60)
+            if response.status_code == 304:
+                # Not Modified answers skip the callback, keep them out of the full request latencies
+                name += " (304)"
+                data = self.etags[body][1]
+            elif response.status_code == 200:
+                data = response.json()
+                if "ETag" in response.headers:
+                    self.etags[body] = (response.headers["ETag"], data)
+        except requests.RequestException:
+            pass
+        self.record(name, start, data is not None)
+
+        return data
+
+    def run_session(self):
+        # Page load
+        self.get("index", "/")
+        self.get("_dash-layout", "/_dash-layout")
+        self.get("_dash-dependencies", "/_dash-dependencies")
+        self.callback("page-content.children", {"url.pathname": "/"}, ["url.pathname"])
+
+        # Strategy selection
+        strategy = self.random.choice(self.strategies)
+        data = self.callback("data-store.data", {"strategies-dropdown.value": strategy}, ["strategies-dropdown.value"])
+        if data is None:
+            return
+        values = {"data-store.data": data["response"]["data-store"]["data"],
+                  "pnl-btn-group.value": 1,
+                  "pos-val-btn-group.value": 1}
+
+        for output in ["trades-table.children", "entry-info-table.children", "pos-val-graph-div.children",
+                       "pnl-figure.figure", "balance-value.children"]:
+            self.callback(output, values, ["data-store.data"])
+
+        # PnL and position toggles
+        for button_value in [2, 3, 4, 1]:
+            values["pnl-btn-group.value"] = button_value
+            self.callback("pnl-figure.figure", values, ["pnl-btn-group.value"])
+        for btn_val in [2, 3, 1]:
+            values["pos-val-btn-group.value"] = btn_val
+            self.callback("pos-val-graph-div.children", values, ["pos-val-btn-group.value"])
+
+    def run(self):
+        for _ in range(self.args.sessions):
+            self.run_session()
+
+def merge_results(clients):
+    latencies, errors = {}, {}
+    for client in clients:
+        for name, val in client.latencies.items():
+            latencies.setdefault(name, []).extend(val)
+        for name, count in client.errors.items():
+            errors[name] = errors.get(name, 0) + count
+    return latencies, errors
+
+def print_report(latencies, errors, elapsed, memory_samples):
+    total = sum(len(val) for val in latencies.values())
+    print(f"\nRequests: {total}  Elapsed: {elapsed:.2f}s  Throughput: {total / elapsed:.1f} req/s\n")
+
+    print(f"{'endpoint':<28}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, val in sorted(latencies.items()):
+        p50, p95, p99 = np.percentile(np.array(val) * 1000, [50, 95, 99])
+        print(f"{name:<28}{len(val):>8}{errors.get(name, 0):>8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+
+    if memory_samples:
+        print(f"\n{'pid':<10}{'start MB':>10}{'peak MB':>10}{'end MB':>10}")
+        pids = sorted({pid for sample in memory_samples for pid in sample["rss_mb"]})
+        for pid in pids:
+            series = [sample["rss_mb"][pid] for sample in memory_samples if pid in sample["rss_mb"]]
+            print(f"{pid:<10}{series[0]:>10.1f}{max(series):>10.1f}{series[-1]:>10.1f}")
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    proc = None
+    if args.url is None:
+        proc, url = start_server(args.port, args.workers)
+    else:
+        url = args.url.rstrip("/")
+
+    memory_samples = []
+    stop_event = threading.Event()
+    try:
+        if proc is not None:
+            threading.Thread(target=sample_memory, args=(proc.pid, args.memory_interval, memory_samples, stop_event),
+                             daemon=True).start()
+
+        specs = get_callback_specs(url)
+        strategies = sorted(get_strategy_list(STRATEGIES_FOLDER))
+        clients = [SimulatedClient(url, specs, strategies, args, index) for index in range(args.users)]
+        threads = [threading.Thread(target=client.run) for client in clients]
+
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+        latencies, errors = merge_results(clients)
+    finally:
+        stop_event.set()
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print_report(latencies, errors, elapsed, memory_samples)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({"latencies": latencies, "errors": errors, "elapsed": elapsed, "memory": memory_samples}, file)
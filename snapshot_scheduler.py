@@ -0,0 +1,52 @@
+import argparse
+import time
+import traceback
+import pandas as pd
+from app_pages import config, get_strategy_list, STRATEGIES_FOLDER
+from dash_app import get_snapshot_path, refresh_dashboard_snapshot
+
+
+# Candle settings of the running environment ("mock" or "live")
+ENV_CONFIG = config[config["environment"]]
+INTERVAL = ENV_CONFIG.get("interval", "1d")
+DELAY_SECONDS = config["web"]["snapshot"]["delay_seconds"]
+
+def get_next_candle_close(interval, now=None):
+    if now is None:
+        now = pd.Timestamp.now(tz="UTC")
+    interval = pd.Timedelta(interval)
+
+    return now.floor(interval) + interval
+
+def precompute_snapshots():
+    for strategy in get_strategy_list(STRATEGIES_FOLDER):
+        start = time.time()
+        try:
+            refresh_dashboard_snapshot(strategy, force=True)
+            path = get_snapshot_path(strategy)
+            print(f"[{pd.Timestamp.now(tz='UTC'):%Y-%m-%d %H:%M:%S}] {strategy}: {path} ({time.time() - start:.2f}s)")
+        except Exception:
+            # Keep the remaining strategies going, the dashboard falls back to lazy computation
+            print(f"[{pd.Timestamp.now(tz='UTC'):%Y-%m-%d %H:%M:%S}] {strategy}: failed")
+            traceback.print_exc()
+
+def run_scheduler():
+    # Precompute once on start so the first load after a deploy is served from disk
+    precompute_snapshots()
+
+    while True:
+        next_run = get_next_candle_close(INTERVAL) + pd.Timedelta(seconds=DELAY_SECONDS)
+        print(f"Next snapshot run at {next_run:%Y-%m-%d %H:%M:%S} UTC")
+        time.sleep(max((next_run - pd.Timestamp.now(tz="UTC")).total_seconds(), 0))
+        precompute_snapshots()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Precompute dashboard snapshots at every candle close.")
+    parser.add_argument("--once", action="store_true", help="Precompute all strategies once and exit")
+    args = parser.parse_args()
+
+    if args.once:
+        precompute_snapshots()
+    else:
+        run_scheduler()